@@ -1,257 +1,454 @@
+#!/usr/bin/env python3
 """
-Batch Jobs Airflow DAG
+Batch Job Monitor
 
-This DAG orchestrates the execution of batch jobs with dependencies,
-monitoring, and error handling.
+Collects start/end events for batch jobs, stores them in a SQLite database
+and exposes the resulting metrics to Prometheus for the Grafana dashboard.
 
-Save this file to your Airflow DAGs directory.
+Writes are buffered in memory and flushed to SQLite in batches by a
+background thread, so registering a job start or end never waits on an
+fsync in the job's critical path.
+
+Usage:
+    python batch_job_monitor.py --storage data/job_metrics.db --port 8000
 """
 
-from datetime import datetime, timedelta
-from airflow import DAG
-from airflow.operators.python_operator import PythonOperator
-from airflow.operators.bash_operator import BashOperator
-from airflow.operators.dummy_operator import DummyOperator
-from airflow.operators.python_operator import BranchPythonOperator
-import sqlite3
-import requests
+import argparse
+import atexit
+import datetime
+import itertools
 import os
-import sys
-
-# Default arguments for the DAG
-default_args = {
-    'owner': 'data_team',
-    'depends_on_past': False,
-    'start_date': datetime(2025, 5, 1),
-    'email': ['alerts@yourdomain.com'],
-    'email_on_failure': True,
-    'email_on_retry': False,
-    'retries': 1,
-    'retry_delay': timedelta(minutes=5),
-}
-
-# Create DAG
-dag = DAG(
-    'batch_job_processing',
-    default_args=default_args,
-    description='Batch job processing workflow',
-    schedule_interval='0 1 * * *',  # Run daily at 1 AM
-    catchup=False,
-    max_active_runs=1
-)
+import queue
+import sqlite3
+import threading
+import time
 
-# Helper function to register job in the monitoring system
-def register_job_start(job_name):
-    """Register the start of a batch job in the monitoring system"""
-    import sqlite3
-    import datetime
-    
-    db_path = "/path/to/storage/job_metrics.db"
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    
-    start_time = datetime.datetime.now().isoformat()
-    
-    cursor.execute(
-        'INSERT INTO jobs (name, start, status) VALUES (?, ?, ?)',
-        (job_name, start_time, 'running')
-    )
-    
-    job_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
-    
-    return job_id
-
-def register_job_end(job_id, status="completed"):
-    """Register the end of a batch job in the monitoring system"""
-    import sqlite3
-    import datetime
-    
-    db_path = "/path/to/storage/job_metrics.db"
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    
-    end_time = datetime.datetime.now().isoformat()
-    
-    # Get job details
-    cursor.execute('SELECT name, start FROM jobs WHERE id = ?', (job_id,))
-    result = cursor.fetchone()
-    
-    if not result:
-        print(f"Job with ID {job_id} not found")
-        conn.close()
-        return
-    
-    job_name, start_time_str = result
-    
-    # Calculate duration
-    start_time = datetime.datetime.fromisoformat(start_time_str.replace('Z', '+00:00'))
-    end_time_dt = datetime.datetime.fromisoformat(end_time.replace('Z', '+00:00'))
-    duration_seconds = (end_time_dt - start_time).total_seconds()
-    
-    # Update job record
-    cursor.execute(
-        'UPDATE jobs SET end = ?, duration = ?, status = ? WHERE id = ?',
-        (end_time, duration_seconds, status, job_id)
-    )
-    
-    conn.commit()
-    conn.close()
-
-# Wrapper function for tasks to enable monitoring
-def monitored_task(job_name, task_function, **kwargs):
-    """Wrapper function to monitor task execution"""
-    job_id = register_job_start(job_name)
-    try:
-        result = task_function(**kwargs)
-        register_job_end(job_id, "completed")
-        return result
-    except Exception as e:
-        register_job_end(job_id, "failed")
-        raise
-
-# Define the actual task functions
-def data_ingestion_task(**kwargs):
-    """Data ingestion task implementation"""
-    print("Starting data ingestion...")
-    # Your data ingestion code here
-    # Example:
-    # import pandas as pd
-    # data = pd.read_csv('/path/to/source.csv')
-    # data.to_sql('raw_data', engine)
-    print("Data ingestion completed")
-    
-def data_transformation_task(**kwargs):
-    """Data transformation task implementation"""
-    print("Starting data transformation...")
-    # Your data transformation code here
-    # Example:
-    # import pandas as pd
-    # from sklearn.preprocessing import StandardScaler
-    # data = pd.read_sql('SELECT * FROM raw_data', engine)
-    # scaler = StandardScaler()
-    # data_scaled = scaler.fit_transform(data)
-    # pd.DataFrame(data_scaled).to_sql('transformed_data', engine)
-    print("Data transformation completed")
-    
-def ml_training_task(**kwargs):
-    """Machine learning training task implementation"""
-    print("Starting ML model training...")
-    # Your ML training code here
-    # Example:
-    # import pandas as pd
-    # from sklearn.ensemble import RandomForestClassifier
-    # data = pd.read_sql('SELECT * FROM transformed_data', engine)
-    # X = data.drop('target', axis=1)
-    # y = data['target']
-    # model = RandomForestClassifier()
-    # model.fit(X, y)
-    # import joblib
-    # joblib.dump(model, '/path/to/model.pkl')
-    print("ML model training completed")
-    
-def report_generation_task(**kwargs):
-    """Report generation task implementation"""
-    print("Starting report generation...")
-    # Your report generation code here
-    # Example:
-    # import pandas as pd
-    # import matplotlib.pyplot as plt
-    # data = pd.read_sql('SELECT * FROM metrics', engine)
-    # plt.figure(figsize=(10, 6))
-    # data.plot(kind='bar')
-    # plt.savefig('/path/to/report.png')
-    print("Report generation completed")
-    
-def data_cleanup_task(**kwargs):
-    """Data cleanup task implementation"""
-    print("Starting data cleanup...")
-    # Your data cleanup code here
-    # Example:
-    # import sqlite3
-    # conn = sqlite3.connect('/path/to/database.db')
-    # cursor = conn.cursor()
-    # cursor.execute('DELETE FROM temp_data WHERE created_at < date("now", "-30 day")')
-    # conn.commit()
-    # conn.close()
-    print("Data cleanup completed")
-
-def check_data_quality(**kwargs):
-    """Check if data quality is sufficient to proceed with ML training"""
-    # Your data quality check code here
-    # Example:
-    # import pandas as pd
-    # data = pd.read_sql('SELECT * FROM transformed_data', engine)
-    # missing_values = data.isnull().sum().sum()
-    # if missing_values > threshold:
-    #     return 'skip_ml_training'
-    # else:
-    #     return 'ml_training'
-    return 'ml_training'  # Default to proceeding with ML training
-
-# Create the tasks
-start = DummyOperator(
-    task_id='start',
-    dag=dag,
-)
+import orjson
+from prometheus_client import start_http_server, Counter, Gauge
 
-data_ingestion = PythonOperator(
-    task_id='data_ingestion',
-    python_callable=lambda **kwargs: monitored_task('data_ingestion', data_ingestion_task, **kwargs),
-    provide_context=True,
-    dag=dag,
+# Prometheus metrics exposed to the scraper
+JOB_DURATION = Gauge(
+    'batch_job_duration_seconds',
+    'Duration of the most recent run of a batch job in seconds',
+    ['job_name', 'status']
 )
-
-data_transformation = PythonOperator(
-    task_id='data_transformation',
-    python_callable=lambda **kwargs: monitored_task('data_transformation', data_transformation_task, **kwargs),
-    provide_context=True,
-    dag=dag,
+JOB_COUNT = Counter(
+    'batch_job_count',
+    'Total number of batch job runs',
+    ['job_name', 'status']
 )
-
-data_quality_check = BranchPythonOperator(
-    task_id='data_quality_check',
-    python_callable=check_data_quality,
-    provide_context=True,
-    dag=dag,
+JOB_START_TIME = Gauge(
+    'batch_job_start_timestamp',
+    'Unix timestamp of the most recent start of a batch job',
+    ['job_name']
 )
 
-ml_training = PythonOperator(
-    task_id='ml_training',
-    python_callable=lambda **kwargs: monitored_task('ml_training', ml_training_task, **kwargs),
-    provide_context=True,
-    dag=dag,
-)
+DEFAULT_DB_PATH = 'data/job_metrics.db'
 
-skip_ml_training = DummyOperator(
-    task_id='skip_ml_training',
-    dag=dag,
-)
+# Flush the write queue when it grows past this many events, or after this
+# many seconds, whichever comes first.
+FLUSH_BATCH_SIZE = 100
+FLUSH_INTERVAL_SECONDS = 0.25
 
-report_generation = PythonOperator(
-    task_id='report_generation',
-    python_callable=lambda **kwargs: monitored_task('report_generation', report_generation_task, **kwargs),
-    provide_context=True,
-    dag=dag,
-)
+# Rows per multi-row INSERT during a flush. At 4 bound parameters per row
+# this stays well under SQLite's 999-parameter limit.
+INSERT_CHUNK_ROWS = 100
 
-data_cleanup = PythonOperator(
-    task_id='data_cleanup',
-    python_callable=lambda **kwargs: monitored_task('data_cleanup', data_cleanup_task, **kwargs),
-    provide_context=True,
-    dag=dag,
-)
+_INSERT_PREFIX = ('INSERT INTO job_metrics '
+                  '(id, job_name, start_time, status) VALUES ')
+_INSERT_ONE_ROW = _INSERT_PREFIX + '(?, ?, ?, ?)'
+_INSERT_IGNORE_ONE_ROW = ('INSERT OR IGNORE INTO job_metrics '
+                          '(id, job_name, start_time, status) '
+                          'VALUES (?, ?, ?, ?)')
+_INSERT_CHUNK = _INSERT_PREFIX + ','.join(['(?, ?, ?, ?)'] * INSERT_CHUNK_ROWS)
+
+# Fixed query text so SQLite reuses the cached prepared statement instead
+# of re-parsing a freshly built string on every call.
+_SELECT_RECENT = ('SELECT job_name, start_time, end_time, duration_seconds, '
+                  'status FROM job_metrics ORDER BY start_time DESC LIMIT ?')
+_SELECT_COMPLETED = ('SELECT job_name, start_time, end_time, '
+                     'duration_seconds, status FROM job_metrics '
+                     'WHERE end_time IS NOT NULL '
+                     'ORDER BY start_time DESC LIMIT ?')
+
+
+class BatchJobMonitor:
+    """Records batch job executions in SQLite and updates Prometheus metrics.
+
+    A single long-lived connection is shared by all reads and writes. Job
+    starts and ends are appended to in-memory queues and written out by a
+    background flusher thread inside one transaction per batch, instead of
+    paying a connection setup plus an autocommit fsync per event.
+    """
+
+    def __init__(self, db_path=DEFAULT_DB_PATH):
+        self.db_path = db_path
+        self._init_db()
+
+        # Start/end events drained by the flusher thread, which owns all
+        # per-event work: duration computation, Prometheus updates and the
+        # batched DB writes. The event is set whenever the queue grows
+        # large enough to be worth flushing before the next timed flush.
+        self._events = queue.SimpleQueue()
+        self._flush_needed = threading.Event()
+
+        # Rows drained from the queue whose transaction failed; retried on
+        # the next flush instead of being dropped.
+        self._unflushed_starts = []
+        self._unflushed_ends = []
+
+        # Serializes transactions on the shared connection between the
+        # flusher thread and callers that read (which flush first).
+        self._write_lock = threading.Lock()
+
+        # Job ids are assigned locally so register_job_start can return
+        # immediately instead of waiting for its INSERT to be flushed.
+        row = self.conn.execute('SELECT MAX(id) FROM job_metrics').fetchone()
+        self._next_job_id = row[0] or 0
+        self._id_lock = threading.Lock()
+
+        # Start times of in-flight jobs, so register_job_end can compute a
+        # duration without reading a row that may not be flushed yet.
+        self._start_times = {}
+
+        # Cached child metrics per label set. Every .labels() call hashes
+        # the label values and takes the client library's internal lock, so
+        # resolve each child once and update it through the stored handle.
+        self._start_children = {}
+        self._duration_children = {}
+        self._count_children = {}
+
+        self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+        self._flusher.start()
+        atexit.register(self._flush_and_close)
+
+    def _init_db(self):
+        """Open the long-lived connection and bootstrap PRAGMAs + schema."""
+        db_dir = os.path.dirname(self.db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        # Single long-lived connection used for all reads and batched
+        # writes. isolation_level=None leaves transaction control to us.
+        self.conn = sqlite3.connect(
+            self.db_path, isolation_level=None, check_same_thread=False
+        )
+
+        # One executescript call sets up tuning PRAGMAs and schema in a
+        # single pass: WAL with synchronous=NORMAL trades an fsync per
+        # commit for one per checkpoint, cache_size=-64000 gives SQLite a
+        # 64MB page cache, and mmap_size=256MB lets reads be served from
+        # the kernel page cache without syscalls. The index turns the
+        # ORDER BY start_time DESC LIMIT query into an index range scan
+        # instead of a full-table sort as the table grows.
+        self.conn.executescript('''
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA wal_autocheckpoint=1000;
+            PRAGMA busy_timeout=5000;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA cache_size=-64000;
+            PRAGMA mmap_size=268435456;
+            CREATE TABLE IF NOT EXISTS job_metrics (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_name TEXT NOT NULL,
+                start_time REAL NOT NULL,
+                end_time REAL,
+                duration_seconds REAL,
+                status TEXT DEFAULT 'running',
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            );
+            CREATE INDEX IF NOT EXISTS idx_jobs_start
+            ON job_metrics(start_time DESC);
+        ''')
+
+    def register_job_start(self, job_name):
+        """Register the start of a batch job and return its job id."""
+        start_ts = time.time()
+
+        with self._id_lock:
+            self._next_job_id += 1
+            job_id = self._next_job_id
+
+        self._start_times[job_id] = (job_name, start_ts)
+
+        self._events.put_nowait(('start', job_id, job_name, start_ts))
+        if self._events.qsize() >= FLUSH_BATCH_SIZE:
+            self._flush_needed.set()
+
+        child = self._start_children.get(job_name)
+        if child is None:
+            child = self._start_children.setdefault(
+                job_name, JOB_START_TIME.labels(job_name=job_name))
+        child.set(start_ts)
+
+        return job_id
+
+    def register_job_end(self, job_id, status='completed'):
+        """Register the end of a batch job.
+
+        Only enqueues the event; duration computation, Prometheus updates
+        and the DB write all happen on the flusher thread so the caller's
+        critical path never waits on monitoring I/O.
+        """
+        self._events.put_nowait(('end', job_id, status, time.time()))
+        if self._events.qsize() >= FLUSH_BATCH_SIZE:
+            self._flush_needed.set()
+
+    def _complete_job(self, job_id, status, end_ts):
+        """Resolve an end event: update metrics, return the UPDATE row."""
+        job = self._start_times.pop(job_id, None)
+        if job is None:
+            # Job started by another process (or before a restart); fall
+            # back to the stored row.
+            row = self.conn.execute(
+                'SELECT job_name, start_time FROM job_metrics WHERE id = ?',
+                (job_id,)
+            ).fetchone()
+            if not row:
+                print(f"Job with ID {job_id} not found")
+                return None
+            job = (row[0], row[1])
+
+        job_name, start_ts = job
+        duration_seconds = end_ts - start_ts
+
+        key = (job_name, status)
+        duration_child = self._duration_children.get(key)
+        if duration_child is None:
+            duration_child = self._duration_children.setdefault(
+                key, JOB_DURATION.labels(job_name=job_name, status=status))
+        count_child = self._count_children.get(key)
+        if count_child is None:
+            count_child = self._count_children.setdefault(
+                key, JOB_COUNT.labels(job_name=job_name, status=status))
+        duration_child.set(duration_seconds)
+        count_child.inc()
+
+        return (end_ts, duration_seconds, status, job_id)
+
+    def _flush_loop(self):
+        """Background thread: flush the event queue periodically."""
+        while True:
+            self._flush_needed.wait(FLUSH_INTERVAL_SECONDS)
+            self._flush_needed.clear()
+            try:
+                self._flush()
+            except Exception as e:
+                # A transient failure (SQLITE_BUSY past the busy_timeout,
+                # full disk) must not kill the flusher for the life of the
+                # process; the drained rows are kept and retried next pass.
+                print(f"Flush failed, will retry: {e}")
+
+    def _flush(self):
+        """Drain queued events and write them in a single transaction.
+
+        The drain and the write happen under one lock: if two threads
+        interleaved on the queue, one could drain and commit a job's end
+        UPDATE before the other committed its start INSERT, leaving the
+        row 'running' forever while the metrics already moved on.
+        """
+        with self._write_lock:
+            starts = []
+            ends = []
+            while True:
+                try:
+                    event = self._events.get_nowait()
+                except queue.Empty:
+                    break
+                if event[0] == 'start':
+                    _, job_id, job_name, start_ts = event
+                    starts.append((job_id, job_name, start_ts, 'running'))
+                else:
+                    _, job_id, status, end_ts = event
+                    end_row = self._complete_job(job_id, status, end_ts)
+                    if end_row is not None:
+                        ends.append(end_row)
+
+            # Rows kept back by a previously failed transaction go first.
+            if self._unflushed_starts:
+                starts = self._unflushed_starts + starts
+                self._unflushed_starts = []
+            if self._unflushed_ends:
+                ends = self._unflushed_ends + ends
+                self._unflushed_ends = []
+
+            if not starts and not ends:
+                return
+
+            cursor = self.conn.cursor()
+            try:
+                cursor.execute('BEGIN IMMEDIATE')
+                try:
+                    # Multi-row VALUES expansion: one statement step per
+                    # chunk of rows instead of one per row, with a
+                    # single-row statement reused for the tail.
+                    full = len(starts) - len(starts) % INSERT_CHUNK_ROWS
+                    for offset in range(0, full, INSERT_CHUNK_ROWS):
+                        chunk = starts[offset:offset + INSERT_CHUNK_ROWS]
+                        cursor.execute(
+                            _INSERT_CHUNK,
+                            list(itertools.chain.from_iterable(chunk))
+                        )
+                    if full < len(starts):
+                        cursor.executemany(_INSERT_ONE_ROW, starts[full:])
+                except sqlite3.IntegrityError:
+                    # An id collision (e.g. a second writer assigned the
+                    # same locally-computed id) must not poison the batch
+                    # into failing on every retry: redo the inserts row by
+                    # row, skipping only the colliding rows. Rows already
+                    # inserted above are skipped as their own duplicates.
+                    cursor.executemany(_INSERT_IGNORE_ONE_ROW, starts)
+                if ends:
+                    cursor.executemany(
+                        'UPDATE job_metrics '
+                        'SET end_time = ?, duration_seconds = ?, status = ? '
+                        'WHERE id = ?',
+                        ends
+                    )
+                cursor.execute('COMMIT')
+            except Exception:
+                # Stash the drained rows first so the next flush retries
+                # them instead of silently dropping them — BEGIN IMMEDIATE
+                # itself can fail (e.g. database is locked), and a ROLLBACK
+                # with no open transaction would raise and skip the stash.
+                self._unflushed_starts = starts + self._unflushed_starts
+                self._unflushed_ends = ends + self._unflushed_ends
+                if self.conn.in_transaction:
+                    cursor.execute('ROLLBACK')
+                raise
+
+    def _flush_and_close(self):
+        """Flush outstanding events and close the connection on shutdown."""
+        self._flush()
+        self.conn.close()
+
+    def get_recent_jobs(self, limit=20):
+        """Return the most recent jobs as a pandas DataFrame."""
+        # Imported lazily: pandas costs ~300ms and ~80MB at import time,
+        # and the register/serve paths never need it.
+        import pandas as pd
+
+        self._flush()
+
+        # Arrow-backed dtypes keep job_name/status out of NumPy object
+        # arrays, which downstream consumers like export() convert to
+        # records without per-element boxing.
+        df = pd.read_sql_query(_SELECT_RECENT, self.conn,
+                               params=(limit,), dtype_backend='pyarrow')
+        df['start_time'] = pd.to_datetime(df['start_time'], unit='s')
+        df['end_time'] = pd.to_datetime(df['end_time'], unit='s')
+        return df
+
+    def export(self, output_path='job_metrics.parquet', fmt='parquet'):
+        """Export recent completed jobs to a file for external tools.
+
+        Parquet (default) and Feather are far smaller on disk and faster
+        for Arrow-aware consumers (Grafana Infinity, DuckDB) to read than
+        indented JSON, which is kept for backward compatibility.
+        """
+        if fmt == 'json':
+            # Fast path: JSON never needs a DataFrame, so cursor straight
+            # into orjson and skip the pandas import and materialization.
+            self._flush()
+            rows = self.conn.execute(_SELECT_COMPLETED, (1000,)).fetchall()
+            jobs_data = [
+                {
+                    'job_name': job_name,
+                    'start_time': datetime.datetime.fromtimestamp(
+                        start_ts).isoformat(timespec='seconds'),
+                    'end_time': datetime.datetime.fromtimestamp(
+                        end_ts).isoformat(timespec='seconds'),
+                    'duration_seconds': duration_seconds,
+                    'status': status,
+                }
+                for job_name, start_ts, end_ts, duration_seconds, status
+                in rows
+            ]
+            with open(output_path, 'wb') as f:
+                f.write(orjson.dumps(jobs_data, option=orjson.OPT_INDENT_2))
+            print(f"Exported {len(jobs_data)} jobs to {output_path}")
+            return
+
+        df = self.get_recent_jobs(limit=1000)
+        # Select completed jobs with one NumPy-level boolean mask instead
+        # of dropna's per-subset column pass.
+        mask = (df['end_time'].notna().to_numpy()
+                & df['duration_seconds'].notna().to_numpy())
+        df = df[mask]
+
+        if fmt == 'parquet':
+            df.to_parquet(output_path, compression='zstd', index=False)
+        elif fmt == 'feather':
+            df.to_feather(output_path, compression='lz4')
+        else:
+            raise ValueError(f"Unsupported export format: {fmt}")
+
+        print(f"Exported {len(df)} jobs to {output_path}")
+
+    def export_to_json(self, output_path='job_metrics.json'):
+        """Backward-compatible JSON export; see export()."""
+        self.export(output_path, fmt='json')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Batch job monitoring service')
+    parser.add_argument('--storage', default=DEFAULT_DB_PATH,
+                        help='Path to the SQLite database')
+    parser.add_argument('--port', type=int, default=8000,
+                        help='Port for the Prometheus metrics server')
+    parser.add_argument('--simulate', action='store_true',
+                        help='Generate demo job runs for the dashboard')
+    parser.add_argument('--export', action='store_true',
+                        help='Export metrics to a file and exit')
+    parser.add_argument('--format', choices=['parquet', 'feather', 'json'],
+                        default=None,
+                        help='Export file format (default: inferred from '
+                             'the --output extension, else parquet)')
+    parser.add_argument('--output', default=None,
+                        help='Output path for --export '
+                             '(default: job_metrics.<format>)')
+    args = parser.parse_args()
+
+    monitor = BatchJobMonitor(db_path=args.storage)
+
+    if args.export:
+        fmt = args.format
+        if fmt is None:
+            # Infer from the output extension so documented invocations
+            # like --output job_metrics.json keep producing JSON.
+            ext = os.path.splitext(args.output or '')[1].lstrip('.')
+            fmt = ext if ext in ('parquet', 'feather', 'json') else 'parquet'
+        output = args.output or f'job_metrics.{fmt}'
+        monitor.export(output, fmt=fmt)
+        return
+
+    start_http_server(args.port)
+    print(f"Prometheus metrics server started on port {args.port}")
+
+    if args.simulate:
+        demo_jobs = ['data_ingestion', 'data_transformation', 'ml_training',
+                     'report_generation', 'data_cleanup']
+        # Simulated work: compute each job's stable pseudo-random duration
+        # once, outside the loop, so profiling the registration path only
+        # measures the registration path.
+        sleeps = {name: 2 + (hash(name) & 7) for name in demo_jobs}
+        for cycle in range(3):
+            for job_name in demo_jobs:
+                job_id = monitor.register_job_start(job_name)
+                time.sleep(sleeps[job_name])
+                status = 'failed' if cycle == 2 and job_name == 'ml_training' \
+                    else 'completed'
+                monitor.register_job_end(job_id, status=status)
+        monitor.export()
+
+    # Keep serving metrics until interrupted
+    try:
+        while True:
+            time.sleep(60)
+    except KeyboardInterrupt:
+        pass
 
-end = DummyOperator(
-    task_id='end',
-    dag=dag,
-    trigger_rule='none_failed',
-)
 
-# Define task dependencies
-start >> data_ingestion >> data_transformation >> data_quality_check
-data_quality_check >> [ml_training, skip_ml_training]
-ml_training >> report_generation
-skip_ml_training >> report_generation
-report_generation >> data_cleanup >> end
\ No newline at end of file
+if __name__ == '__main__':
+    main()